@@ -10,7 +10,15 @@ load_dotenv()
 
 MAX_TRADEMARKS = int(os.getenv("MAX_TRADEMARKS", "100"))
 
+# Keep a Parquet copy of the parsed sheet next to the Excel file for faster reruns
+EXCEL_CACHE = os.getenv("EXCEL_CACHE", "0") == "1"
+
+# Worker processes used to transform and clean large batches (1 = in-process, no pool)
+WORKERS = int(os.getenv("WORKERS", "1"))
+
 # Output Settings
+# Include each source record as raw_data in the JSON output (debugging aid)
+KEEP_RAW_DATA = os.getenv("KEEP_RAW_DATA", "0") == "1"
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")
 OUTPUT_JSON_FILE = os.getenv("OUTPUT_JSON_FILE", "trademarks_cleaned.json")
 OUTPUT_CSV_FILE = os.getenv("OUTPUT_CSV_FILE", "trademarks_cleaned.csv")
@@ -5,14 +5,72 @@ Data cleaning and normalization module
 from typing import Dict, List
 import re
 
+_CORP_SUFFIX_RE = re.compile(r'\s+(Inc\.?|LLC|L\.L\.C\.?|Corp\.?|Corporation|Ltd\.?|Limited)$', re.IGNORECASE)
+# Lower-cased words matched by _CORP_SUFFIX_RE
+_CORP_SUFFIXES = frozenset({
+    "inc", "inc.", "llc", "l.l.c", "l.l.c.", "corp", "corp.", "corporation", "ltd", "ltd.", "limited"
+})
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+# str.translate table deleting every ASCII character except digits and '+'
+_PHONE_DELETE_ASCII = {code: None for code in range(128) if chr(code) not in "0123456789+"}
+
+# Columns produced by DataCleaner.flatten_record for a cleaned trademark record
+FLATTENED_FIELDS = [
+    "registration_number", "serial_number", "registration_date", "expiry_date",
+    "status", "mark_text", "mark_drawing_code", "representative",
+    "filing_date", "published_date", "goods_services",
+    "owner_name", "owner_address", "owner_city", "owner_state", "owner_country", "owner_postal_code",
+    "rep_name", "rep_firm", "rep_address", "rep_phone", "rep_email",
+    "class_numbers", "class_count",
+    "event_count", "latest_event_date", "latest_event_type"
+]
+
+# Fields every cleaned trademark record carries, with their empty values
+_REQUIRED_STRUCTURE = {
+    "registration_number": None,
+    "serial_number": None,
+    "registration_date": None,
+    "expiry_date": None,
+    "status": None,
+    "mark_text": None,
+    "mark_drawing_code": None,
+    "classes": [],
+    "owner": {
+        "name": None,
+        "address": None,
+        "city": None,
+        "state": None,
+        "country": None,
+        "postal_code": None
+    },
+    "representative": None,
+    "events": [],
+    "filing_date": None,
+    "published_date": None,
+    "goods_services": None
+}
+
 
 class DataCleaner:
     """Clean and normalize trademark data"""
     
     @staticmethod
-    def clean_trademark(record: Dict) -> Dict:
-        """Clean a single trademark record"""
-        cleaned = record.copy()
+    def clean_trademark(record: Dict, already_normalized: bool = False) -> Dict:
+        """
+        Clean a single trademark record in place
+        
+        The record and its owner/representative dicts are modified directly;
+        pass a copy if the original values are still needed.
+        
+        Args:
+            record: Trademark record to clean
+            already_normalized: Record already has the full DataTransformer.transform_trademark
+                structure, so the required-fields check is skipped
+            
+        Returns:
+            The same record, cleaned
+        """
+        cleaned = record
         
         if "owner" in cleaned and cleaned["owner"]:
             cleaned["owner"] = DataCleaner._clean_owner(cleaned["owner"])
@@ -24,22 +82,23 @@ class DataCleaner:
             if field in cleaned and cleaned[field]:
                 cleaned[field] = DataCleaner._normalize_text(cleaned[field])
         
-        cleaned = DataCleaner._ensure_required_fields(cleaned)
+        if not already_normalized:
+            cleaned = DataCleaner._ensure_required_fields(cleaned)
         
         return cleaned
     
     @staticmethod
     def _clean_owner(owner: Dict) -> Dict:
-        """Clean owner information"""
+        """Clean owner information in place"""
         if not owner:
             return owner
         
-        cleaned_owner = owner.copy()
+        cleaned_owner = owner
         
         if "name" in cleaned_owner and cleaned_owner["name"]:
-            cleaned_owner["name"] = DataCleaner._normalize_text(cleaned_owner["name"])
-            cleaned_owner["name"] = re.sub(r'\s+(Inc\.?|LLC|L\.L\.C\.?|Corp\.?|Corporation|Ltd\.?|Limited)$',
-                                          '', cleaned_owner["name"], flags=re.IGNORECASE)
+            cleaned_owner["name"] = DataCleaner._strip_corp_suffix(
+                DataCleaner._normalize_text(cleaned_owner["name"])
+            )
         
         if "address" in cleaned_owner and cleaned_owner["address"]:
             cleaned_owner["address"] = DataCleaner._normalize_text(cleaned_owner["address"])
@@ -58,20 +117,33 @@ class DataCleaner:
         
         return cleaned_owner
     
+    @staticmethod
+    def _strip_corp_suffix(name: str) -> str:
+        """Drop a trailing corporate suffix (Inc, LLC, Corp, Ltd...) from a whitespace-normalized name"""
+        head, sep, last = name.rpartition(" ")
+        if not last.isascii():
+            # Case-insensitive regex matching also accepts a few non-ASCII letters (e.g. dotless i)
+            return _CORP_SUFFIX_RE.sub('', name)
+        return head if sep and last.lower() in _CORP_SUFFIXES else name
+    
     @staticmethod
     def _clean_representative(rep: Dict) -> Dict:
-        """Clean representative information"""
+        """Clean representative information in place"""
         if not rep:
             return rep
         
-        cleaned_rep = rep.copy()
+        cleaned_rep = rep
         
         for field in ["name", "firm", "address"]:
             if field in cleaned_rep and cleaned_rep[field]:
                 cleaned_rep[field] = DataCleaner._normalize_text(cleaned_rep[field])
         
         if "phone" in cleaned_rep and cleaned_rep["phone"]:
-            cleaned_rep["phone"] = re.sub(r'[^\d+]', '', cleaned_rep["phone"])
+            phone = cleaned_rep["phone"].translate(_PHONE_DELETE_ASCII)
+            if not phone.isascii():
+                # Non-ASCII digits are kept and other non-ASCII characters dropped by the regex
+                phone = _PHONE_STRIP_RE.sub('', phone)
+            cleaned_rep["phone"] = phone
         
         if "email" in cleaned_rep and cleaned_rep["email"]:
             cleaned_rep["email"] = cleaned_rep["email"].strip().lower()
@@ -83,54 +155,32 @@ class DataCleaner:
         """Normalize text by removing extra whitespace"""
         if not text or not isinstance(text, str):
             return text
-        return re.sub(r'\s+', ' ', text.strip())
+        return " ".join(text.split())
     
     @staticmethod
     def _ensure_required_fields(record: Dict) -> Dict:
-        """Ensure all required fields exist"""
-        required_structure = {
-            "registration_number": None,
-            "serial_number": None,
-            "registration_date": None,
-            "expiry_date": None,
-            "status": None,
-            "mark_text": None,
-            "mark_drawing_code": None,
-            "classes": [],
-            "owner": {
-                "name": None,
-                "address": None,
-                "city": None,
-                "state": None,
-                "country": None,
-                "postal_code": None
-            },
-            "representative": None,
-            "events": [],
-            "filing_date": None,
-            "published_date": None,
-            "goods_services": None
-        }
-        
-        cleaned = required_structure.copy()
-        cleaned.update(record)
-        
-        if "owner" in record and record["owner"]:
-            cleaned["owner"] = {**required_structure["owner"], **record["owner"]}
+        """Ensure all required fields exist, filling missing ones in place"""
+        for key, default in _REQUIRED_STRUCTURE.items():
+            if key not in record:
+                record[key] = default.copy() if isinstance(default, (dict, list)) else default
+        
+        if record["owner"]:
+            for key in _REQUIRED_STRUCTURE["owner"]:
+                record["owner"].setdefault(key, None)
         else:
-            cleaned["owner"] = required_structure["owner"].copy()
+            record["owner"] = _REQUIRED_STRUCTURE["owner"].copy()
         
-        if "classes" not in cleaned or not isinstance(cleaned["classes"], list):
-            cleaned["classes"] = []
+        if not isinstance(record["classes"], list):
+            record["classes"] = []
         
-        if "events" not in cleaned or not isinstance(cleaned["events"], list):
-            cleaned["events"] = []
+        if not isinstance(record["events"], list):
+            record["events"] = []
         
-        return cleaned
+        return record
     
     @staticmethod
     def clean_batch(records: List[Dict]) -> List[Dict]:
-        """Clean a batch of trademark records"""
+        """Clean a batch of trademark records in place"""
         return [DataCleaner.clean_trademark(record) for record in records]
     
     @staticmethod
@@ -174,15 +224,16 @@ class DataCleaner:
         if "events" in flattened and isinstance(flattened["events"], list):
             events = flattened.pop("events")
             flattened["event_count"] = len(events)
-            if events:
-                # Get latest event date
-                latest_event = max([e for e in events if e.get("date")], 
-                                 key=lambda x: x.get("date", ""), default=None)
-                flattened["latest_event_date"] = latest_event.get("date") if latest_event else None
-                flattened["latest_event_type"] = latest_event.get("type") if latest_event else None
-            else:
-                flattened["latest_event_date"] = None
-                flattened["latest_event_type"] = None
+            # Get latest event date (first one wins on ties)
+            latest_event = None
+            latest_date = None
+            for event in events:
+                event_date = event.get("date")
+                if event_date and (latest_event is None or event_date > latest_date):
+                    latest_event = event
+                    latest_date = event_date
+            flattened["latest_event_date"] = latest_date
+            flattened["latest_event_type"] = latest_event.get("type") if latest_event else None
         else:
             flattened["event_count"] = 0
             flattened["latest_event_date"] = None
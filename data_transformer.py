@@ -3,21 +3,57 @@ Data transformation module
 Converts trademark data to Markify-like format
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from functools import lru_cache
+import calendar
 import re
 
+_CLASS_RE = re.compile(r'[Cc]lass\s+(\d+)')
+
+# Alias keys for owner and representative sub-fields, in lookup order
+_OWNER_NAME_ALIASES = ("name", "ownerName", "applicantName")
+_OWNER_ADDRESS_ALIASES = ("address", "street", "streetAddress")
+_OWNER_STATE_ALIASES = ("state", "stateProvince")
+_OWNER_COUNTRY_ALIASES = ("country", "countryCode")
+_OWNER_POSTAL_CODE_ALIASES = ("postalCode", "postal_code", "zip")
+_REP_NAME_ALIASES = ("name", "attorneyName")
+_REP_FIRM_ALIASES = ("firm", "lawFirm")
+_REP_PHONE_ALIASES = ("phone", "telephone")
+
+# Single scan over the date shapes accepted by _normalize_date:
+# YYYY-MM-DD (optionally with a time part), YYYY/MM/DD, MM/DD/YYYY or DD/MM/YYYY,
+# DD.MM.YYYY, DD-MM-YYYY, "March 5, 2019" and "5 March 2019"
+_DATE_RE = re.compile(
+    r'(?P<y>[0-9]{4})(?P<ysep>[-/])(?P<ym>[0-9]{1,2})(?P=ysep)(?P<yd>[0-9]{1,2})'
+    r'(?:(?P<tsep>[T ])(?P<H>[0-9]{2}):(?P<M>[0-9]{2}):(?P<S>[0-9]{2})(?P<z>Z?))?'
+    r'|(?P<a>[0-9]{1,2})(?P<sep>[./-])(?P<b>[0-9]{1,2})(?P=sep)(?P<ay>[0-9]{4})'
+    r'|(?P<mon>[A-Za-z]+) (?P<md>[0-9]{1,2}), (?P<my>[0-9]{4})'
+    r'|(?P<dd>[0-9]{1,2}) (?P<dmon>[A-Za-z]+) (?P<dmy>[0-9]{4})'
+)
+_MONTHS = {
+    name.lower(): number
+    for names in (calendar.month_name, calendar.month_abbr)
+    for number, name in enumerate(names) if name
+}
+
+
+def _fmt_ymd(dt: datetime) -> str:
+    """Format a date as YYYY-MM-DD without going through strftime"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
 
 class DataTransformer:
     """Transform trademark data to Markify-like structure"""
     
     @staticmethod
-    def transform_trademark(record: Dict) -> Dict:
+    def transform_trademark(record: Dict, keep_raw_data: bool = False) -> Dict:
         """
         Transform a single trademark record to Markify-like format
         
         Args:
             record: Raw trademark record (from Excel or API)
+            keep_raw_data: Attach the raw record to the output as raw_data
             
         Returns:
             Transformed trademark record in Markify-like format
@@ -66,8 +102,8 @@ class DataTransformer:
                 ["markDrawingCode", "mark_drawing_code", "drawingCode"]
             ),
             
-            "classes": DataTransformer._extract_classes(record),
-            "owner": DataTransformer._extract_owner(record),
+            "classes": DataTransformer._extract_classes(all_sources),
+            "owner": DataTransformer._extract_owner(all_sources),
             "representative": DataTransformer._extract_representative(record),
             "events": DataTransformer._extract_events(record),
             "filing_date": DataTransformer._normalize_date(
@@ -86,11 +122,12 @@ class DataTransformer:
             "goods_services": DataTransformer._extract_field_multisource(
                 all_sources,
                 ["goodsServices", "goods_services", "description", "goodsAndServices"]
-            ),
-            
-            "raw_data": record
+            )
         }
         
+        if keep_raw_data:
+            transformed["raw_data"] = record
+        
         return transformed
     
     @staticmethod
@@ -119,7 +156,8 @@ class DataTransformer:
     def _extract_field_multisource(sources: List[Dict], possible_keys: List[str], default: Any = None) -> Any:
         """Extract field from multiple source dictionaries"""
         for source in sources:
-            if not isinstance(source, dict):
+            # Empty sources (e.g. records without raw_data) cannot match any key
+            if not source or not isinstance(source, dict):
                 continue
             value = DataTransformer._extract_field(source, possible_keys)
             if value is not None and value != "":
@@ -133,58 +171,110 @@ class DataTransformer:
             return None
         
         if isinstance(date_value, str):
-            # Try to parse various date formats
-            date_formats = [
-                "%Y-%m-%d",
-                "%Y/%m/%d",
-                "%m/%d/%Y",
-                "%d/%m/%Y",
-                "%d.%m.%Y",  # Excel format: DD.MM.YYYY
-                "%d-%m-%Y",  # Alternative: DD-MM-YYYY
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%d %H:%M:%S",
-                "%B %d, %Y",
-                "%b %d, %Y",
-                "%d %B %Y",
-                "%d %b %Y"
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    dt = datetime.strptime(date_value, fmt)
-                    return dt.strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
-            
-            # Try to extract date from timestamp string
-            try:
-                timestamp = float(date_value)
-                dt = datetime.fromtimestamp(timestamp)
-                return dt.strftime("%Y-%m-%d")
-            except (ValueError, TypeError):
-                pass
+            return DataTransformer._parse_date_str(date_value)
         
         elif isinstance(date_value, (int, float)):
             # Handle timestamp
             try:
                 dt = datetime.fromtimestamp(date_value)
-                return dt.strftime("%Y-%m-%d")
+                return _fmt_ymd(dt)
             except (ValueError, OSError):
                 return None
         
         elif isinstance(date_value, datetime):
-            return date_value.strftime("%Y-%m-%d")
+            return _fmt_ymd(date_value)
         
         return None
     
     @staticmethod
-    def _extract_classes(record: Dict) -> List[Dict]:
+    @lru_cache(maxsize=4096)
+    def _parse_date_str(date_value: str) -> Optional[str]:
+        """Normalize a date string to YYYY-MM-DD format, memoized per distinct string"""
+        # Try to parse various date formats
+        date_formats = [
+            "%Y-%m-%d",
+            "%Y/%m/%d",
+            "%m/%d/%Y",
+            "%d/%m/%Y",
+            "%d.%m.%Y",  # Excel format: DD.MM.YYYY
+            "%d-%m-%Y",  # Alternative: DD-MM-YYYY
+            "%Y-%m-%dT%H:%M:%S",
+            "%Y-%m-%dT%H:%M:%SZ",
+            "%Y-%m-%d %H:%M:%S",
+            "%B %d, %Y",
+            "%b %d, %Y",
+            "%d %B %Y",
+            "%d %b %Y"
+        ]
+        
+        # Plain ISO dates go straight to the C parser; the shape check keeps
+        # fromisoformat from accepting inputs the formats above would reject
+        if len(date_value) == 10 and date_value[4] == "-" and date_value[7] == "-":
+            try:
+                return _fmt_ymd(datetime.fromisoformat(date_value))
+            except ValueError:
+                pass
+        
+        dt = DataTransformer._match_date(date_value)
+        if dt is not None:
+            return _fmt_ymd(dt)
+        
+        # Fall back to strptime for shapes the fast path does not cover
+        for fmt in date_formats:
+            try:
+                dt = datetime.strptime(date_value, fmt)
+                return _fmt_ymd(dt)
+            except ValueError:
+                continue
+        
+        # Try to extract date from timestamp string
+        try:
+            timestamp = float(date_value)
+            dt = datetime.fromtimestamp(timestamp)
+            return _fmt_ymd(dt)
+        except (ValueError, TypeError):
+            return None
+    
+    @staticmethod
+    def _match_date(date_value: str) -> Optional[datetime]:
+        """Parse the common date shapes with one regex match, None if not matched or invalid"""
+        match = _DATE_RE.fullmatch(date_value)
+        if not match:
+            return None
+        
+        groups = match.groupdict()
+        try:
+            if groups["y"]:
+                if groups["tsep"]:
+                    if groups["ysep"] != "-" or (groups["tsep"] == " " and groups["z"]):
+                        return None
+                    return datetime(int(groups["y"]), int(groups["ym"]), int(groups["yd"]),
+                                    int(groups["H"]), int(groups["M"]), int(groups["S"]))
+                return datetime(int(groups["y"]), int(groups["ym"]), int(groups["yd"]))
+            
+            if groups["a"]:
+                year, first, second = int(groups["ay"]), int(groups["a"]), int(groups["b"])
+                if groups["sep"] == "/":
+                    # MM/DD/YYYY takes precedence over DD/MM/YYYY
+                    try:
+                        return datetime(year, first, second)
+                    except ValueError:
+                        pass
+                return datetime(year, second, first)
+            
+            if groups["mon"]:
+                month = _MONTHS.get(groups["mon"].lower())
+                return datetime(int(groups["my"]), month, int(groups["md"])) if month else None
+            
+            month = _MONTHS.get(groups["dmon"].lower())
+            return datetime(int(groups["dmy"]), month, int(groups["dd"])) if month else None
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _extract_classes(all_sources: List[Dict]) -> List[Dict]:
         """Extract trademark class information"""
         classes = []
-        raw_data = record.get("raw_data", {}) or {}
-        excel_data = raw_data.get("_raw_excel_data", {}) or {}
-        all_sources = [record, raw_data, excel_data]
         
         class_fields = [
             "classes", "internationalClasses", "classCodes",
@@ -227,23 +317,28 @@ class DataTransformer:
                 all_sources, ["goodsServices", "goods_services", "description"]
             )
             if goods_services:
-                class_matches = re.findall(r'[Cc]lass\s+(\d+)', str(goods_services))
+                class_matches = _CLASS_RE.findall(str(goods_services))
                 classes.extend([{"class_number": match, "description": None} for match in class_matches])
         
         return classes
     
     @staticmethod
-    def _extract_owner(record: Dict) -> Dict:
+    def _first(data: Dict, keys: Tuple[str, ...]) -> Any:
+        """Return the first truthy value among keys, same as chaining data.get(key) with `or`"""
+        for key in keys:
+            value = data.get(key)
+            if value:
+                return value
+        return value
+    
+    @staticmethod
+    def _extract_owner(all_sources: List[Dict]) -> Dict:
         """Extract owner/applicant information"""
         owner = {
             "name": None, "address": None, "city": None,
             "state": None, "country": None, "postal_code": None
         }
         
-        raw_data = record.get("raw_data", {}) or {}
-        excel_data = raw_data.get("_raw_excel_data", {}) or {}
-        all_sources = [record, raw_data, excel_data]
-        
         owner_fields = ["owner", "applicant", "assignee", "ownerName", "applicantName"]
         owner_data = None
         
@@ -259,15 +354,16 @@ class DataTransformer:
         
         if owner_data:
             if isinstance(owner_data, dict):
-                owner["name"] = owner_data.get("name") or owner_data.get("ownerName") or owner_data.get("applicantName")
-                for addr_field in ["address", "street", "streetAddress"]:
+                first = DataTransformer._first
+                owner["name"] = first(owner_data, _OWNER_NAME_ALIASES)
+                for addr_field in _OWNER_ADDRESS_ALIASES:
                     if addr_field in owner_data:
                         owner["address"] = owner_data[addr_field]
                         break
                 owner["city"] = owner_data.get("city")
-                owner["state"] = owner_data.get("state") or owner_data.get("stateProvince")
-                owner["country"] = owner_data.get("country") or owner_data.get("countryCode")
-                owner["postal_code"] = owner_data.get("postalCode") or owner_data.get("postal_code") or owner_data.get("zip")
+                owner["state"] = first(owner_data, _OWNER_STATE_ALIASES)
+                owner["country"] = first(owner_data, _OWNER_COUNTRY_ALIASES)
+                owner["postal_code"] = first(owner_data, _OWNER_POSTAL_CODE_ALIASES)
             elif isinstance(owner_data, str):
                 owner["name"] = owner_data
         
@@ -292,10 +388,11 @@ class DataTransformer:
                 break
         
         if rep_data and isinstance(rep_data, dict):
-            rep["name"] = rep_data.get("name") or rep_data.get("attorneyName")
-            rep["firm"] = rep_data.get("firm") or rep_data.get("lawFirm")
+            first = DataTransformer._first
+            rep["name"] = first(rep_data, _REP_NAME_ALIASES)
+            rep["firm"] = first(rep_data, _REP_FIRM_ALIASES)
             rep["address"] = rep_data.get("address")
-            rep["phone"] = rep_data.get("phone") or rep_data.get("telephone")
+            rep["phone"] = first(rep_data, _REP_PHONE_ALIASES)
             rep["email"] = rep_data.get("email")
         
         return rep if any(rep.values()) else None
@@ -329,12 +426,12 @@ class DataTransformer:
             return text
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = " ".join(text.split())
         
         return text
     
     @staticmethod
-    def transform_batch(records: List[Dict]) -> List[Dict]:
+    def transform_batch(records: List[Dict], keep_raw_data: bool = False) -> List[Dict]:
         """Transform a batch of records"""
-        return [DataTransformer.transform_trademark(record) for record in records]
+        return [DataTransformer.transform_trademark(record, keep_raw_data) for record in records]
 
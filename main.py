@@ -3,24 +3,33 @@ Trademark Data Pipeline
 Processes trademark data from Excel files, transforms to Markify-like format, and exports to JSON/CSV
 """
 
+import csv
 import json
 import sys
 import logging
+from datetime import date, time
 from pathlib import Path
 from typing import List, Optional
-import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from config import (
     OUTPUT_DIR, 
     OUTPUT_JSON_FILE, 
     OUTPUT_CSV_FILE, 
     MAX_TRADEMARKS,
+    EXCEL_CACHE,
+    WORKERS,
+    KEEP_RAW_DATA,
     LOG_LEVEL,
     LOG_FILE
 )
 from static_data_loader import StaticDataLoader
-from data_transformer import DataTransformer
-from data_cleaner import DataCleaner
+from data_cleaner import DataCleaner, FLATTENED_FIELDS
+from pipeline import Pipeline
 
 # Configure logging
 logging.basicConfig(
@@ -41,12 +50,33 @@ def ensure_output_dir() -> Path:
     return output_path
 
 
+def _json_default(value):
+    """Encode dates and times from raw Excel cells as ISO strings, as orjson does"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_record(record: dict) -> bytes:
+    """Encode a single record as indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
 def save_json(data: List[dict], filename: str, output_dir: Path) -> str:
-    """Save data as JSON file"""
+    """Save data as JSON file, encoding one record at a time"""
     filepath = output_dir / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    logger.info(f"Saved JSON to: {filepath}")
+    with open(filepath, 'wb') as f:
+        f.write(b'[')
+        separator = b'\n  '
+        for record in data:
+            f.write(separator)
+            # Nest each record one level inside the array
+            f.write(_dump_record(record).replace(b'\n', b'\n  '))
+            separator = b',\n  '
+        f.write(b'\n]' if data else b']')
+    logger.info("Saved JSON to: %s", filepath)
     return str(filepath)
 
 
@@ -57,20 +87,20 @@ def save_csv(data: List[dict], filename: str, output_dir: Path) -> Optional[str]
         return None
     
     try:
-        # Flatten records for CSV
-        flattened_data = [DataCleaner.flatten_record(record) for record in data]
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(flattened_data)
-        
-        # Save to CSV
+        # Flatten records while writing so only one flattened row is alive at a time
         filepath = output_dir / filename
-        df.to_csv(filepath, index=False, encoding='utf-8')
-        logger.info(f"Saved CSV to: {filepath}")
-        logger.info(f"CSV contains {len(df)} rows and {len(df.columns)} columns")
+        row_count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FLATTENED_FIELDS, lineterminator='\n')
+            writer.writeheader()
+            for record in data:
+                writer.writerow(DataCleaner.flatten_record(record))
+                row_count += 1
+        logger.info("Saved CSV to: %s", filepath)
+        logger.info("CSV contains %d rows and %d columns", row_count, len(FLATTENED_FIELDS))
         return str(filepath)
     except Exception as e:
-        logger.error(f"Error saving CSV: {e}")
+        logger.error("Error saving CSV: %s", e)
         return None
 
 
@@ -90,37 +120,33 @@ def main(data_file: Optional[str] = None, max_results: Optional[int] = None):
     
     try:
         data_file = data_file or "data.xls"
-        logger.info(f"Loading data from: {data_file}")
+        logger.info("Loading data from: %s", data_file)
         
         try:
             raw_trademarks = StaticDataLoader.load_from_excel(
                 filepath=data_file,
-                max_records=max_results
+                max_records=max_results,
+                keep_raw=KEEP_RAW_DATA,
+                use_cache=EXCEL_CACHE
             )
             
             if not raw_trademarks:
-                logger.error(f"No trademarks loaded from {data_file}. Check file exists and has data.")
+                logger.error("No trademarks loaded from %s. Check file exists and has data.", data_file)
                 sys.exit(1)
             
-            logger.info(f"Loaded {len(raw_trademarks)} trademark records")
-        except Exception as e:
-            logger.error(f"Error loading data: {e}", exc_info=True)
-            sys.exit(1)
-        
-        logger.info("Transforming data to Markify-like format...")
-        try:
-            transformed_trademarks = DataTransformer.transform_batch(raw_trademarks)
-            logger.info(f"Transformed {len(transformed_trademarks)} trademarks")
+            logger.info("Loaded %d trademark records", len(raw_trademarks))
         except Exception as e:
-            logger.error(f"Error transforming data: {e}", exc_info=True)
+            logger.error("Error loading data: %s", e, exc_info=True)
             sys.exit(1)
         
-        logger.info("Cleaning and normalizing data...")
+        logger.info("Transforming and cleaning data to Markify-like format...")
         try:
-            cleaned_trademarks = DataCleaner.clean_batch(transformed_trademarks)
-            logger.info(f"Cleaned {len(cleaned_trademarks)} trademarks")
+            cleaned_trademarks = Pipeline.process_batch(
+                raw_trademarks, workers=WORKERS, keep_raw_data=KEEP_RAW_DATA
+            )
+            logger.info("Transformed and cleaned %d trademarks", len(cleaned_trademarks))
         except Exception as e:
-            logger.error(f"Error cleaning data: {e}", exc_info=True)
+            logger.error("Error processing data: %s", e, exc_info=True)
             sys.exit(1)
         
         logger.info("Saving outputs...")
@@ -133,23 +159,23 @@ def main(data_file: Optional[str] = None, max_results: Optional[int] = None):
             logger.info("=" * 60)
             logger.info("PIPELINE SUMMARY")
             logger.info("=" * 60)
-            logger.info(f"Total trademarks processed: {len(cleaned_trademarks)}")
-            logger.info(f"Output directory: {output_dir}/")
-            logger.info(f"  - JSON: {OUTPUT_JSON_FILE}")
+            logger.info("Total trademarks processed: %d", len(cleaned_trademarks))
+            logger.info("Output directory: %s/", output_dir)
+            logger.info("  - JSON: %s", OUTPUT_JSON_FILE)
             if csv_path:
-                logger.info(f"  - CSV: {OUTPUT_CSV_FILE}")
+                logger.info("  - CSV: %s", OUTPUT_CSV_FILE)
             logger.info("Pipeline completed successfully")
             logger.info("=" * 60)
             
         except Exception as e:
-            logger.error(f"Error saving outputs: {e}", exc_info=True)
+            logger.error("Error saving outputs: %s", e, exc_info=True)
             sys.exit(1)
             
     except KeyboardInterrupt:
         logger.info("Pipeline interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.critical(f"Unexpected error: {e}", exc_info=True)
+        logger.critical("Unexpected error: %s", e, exc_info=True)
         sys.exit(1)
 
 
@@ -0,0 +1,57 @@
+"""
+Single-pass processing module
+Transforms and cleans trademark records without intermediate copies
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List
+
+from data_transformer import DataTransformer
+from data_cleaner import DataCleaner
+
+# Below this many records the process pool start-up costs more than it saves
+PARALLEL_MIN_RECORDS = 1000
+
+
+class Pipeline:
+    """Transform and clean trademark data in a single pass"""
+    
+    @staticmethod
+    def process(record: Dict, keep_raw_data: bool = False) -> Dict:
+        """
+        Transform and clean a single raw trademark record
+        
+        The freshly transformed record is cleaned in place, so no intermediate
+        copy is made and the required-fields pass is skipped.
+        
+        Args:
+            record: Raw trademark record (from Excel or API)
+            keep_raw_data: Attach the raw record to the output as raw_data
+        
+        Returns:
+            Cleaned trademark record in Markify-like format
+        """
+        trademark = DataTransformer.transform_trademark(record, keep_raw_data)
+        return DataCleaner.clean_trademark(trademark, already_normalized=True)
+    
+    @staticmethod
+    def process_batch(records: List[Dict], workers: int = 1, keep_raw_data: bool = False) -> List[Dict]:
+        """
+        Transform and clean a batch of records
+        
+        Args:
+            records: Raw trademark records
+            workers: Number of worker processes; large batches are split across them when > 1
+            keep_raw_data: Attach each raw record to its output as raw_data
+        
+        Returns:
+            Cleaned trademark records, in input order
+        """
+        if workers <= 1 or len(records) < PARALLEL_MIN_RECORDS:
+            return [Pipeline.process(record, keep_raw_data) for record in records]
+        
+        chunksize = max(32, len(records) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            process = partial(Pipeline.process, keep_raw_data=keep_raw_data)
+            return list(executor.map(process, records, chunksize=chunksize))
@@ -3,152 +3,548 @@ Static Data Loader - Loads trademark data from Excel files
 """
 
 import logging
-import pandas as pd
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Sequence
 import xlrd
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 logger = logging.getLogger(__name__)
 
 
+def _is_missing(value: Any) -> bool:
+    """pd.isna for a single cell value, without importing pandas for plain Python values"""
+    if value is None or (isinstance(value, float) and value != value):
+        return True
+    if isinstance(value, (str, int, float)):
+        return False
+    # Only values read through pandas can be pandas missing markers (NaT, NA)
+    pd = sys.modules.get("pandas")
+    return pd is not None and pd.isna(value)
+
+
+def _normalize_header(header: Any) -> str:
+    """Turn a sheet column header into a record key"""
+    return str(header).strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def _xlsx_row_from_calamine(row: Sequence) -> list:
+    """Convert a python-calamine .xlsx row to the values openpyxl returns for it"""
+    values = []
+    for value in row:
+        value_type = type(value)
+        if value_type is str:
+            if value == '':
+                value = None
+        elif value_type is float:
+            # .xlsx stores whole numbers without a decimal point; openpyxl reads them as int
+            if value.is_integer():
+                value = int(value)
+        elif value_type is date:
+            value = datetime.combine(value, time())
+        values.append(value)
+    return values
+
+
+def _is_header_row(row: Sequence) -> bool:
+    """A row with at least 3 non-empty cells is taken as the header; stops at the third"""
+    non_empty_count = 0
+    for value in row:
+        if value and str(value).strip():
+            non_empty_count += 1
+            if non_empty_count >= 3:
+                return True
+    return False
+
+
 class StaticDataLoader:
     """Load trademark data from static Excel file"""
     
     @staticmethod
-    def load_from_excel(filepath: str = "data.xls", max_records: Optional[int] = None) -> List[Dict]:
+    def load_from_excel(filepath: str = "data.xls", max_records: Optional[int] = None,
+                        keep_raw: bool = False, columns: Optional[List[str]] = None,
+                        dtypes: Optional[Dict[str, Any]] = None, use_cache: bool = False,
+                        sheet_name: Optional[str] = None) -> List[Dict]:
         """
         Load trademark data from Excel file
         
         Args:
             filepath: Path to Excel file (default: data.xls)
             max_records: Optional maximum number of records to load
+            keep_raw: Attach the unformatted row to each record as _raw_excel_data
+            columns: Optional whitelist of sheet column headers to load
+            dtypes: Optional column dtypes; the sheet is then read with pandas (not supported for .xls)
+            use_cache: Reuse a Parquet copy of the sheet, written next to the Excel file
+            sheet_name: Sheet to read (default: the first sheet)
             
         Returns:
             List of trademark records as dictionaries
+            
+        Raises:
+            ValueError: If dtypes are given for an .xls file
         """
         file_path = Path(filepath)
+        StaticDataLoader._check_dtypes(file_path, dtypes)
         
         if not file_path.exists():
-            logger.error(f"Excel file not found: {filepath}")
+            logger.error("Excel file not found: %s", filepath)
             return []
         
-        logger.info(f"Loading static data from: {filepath}")
+        logger.info("Loading static data from: %s", filepath)
         
         try:
-            file_ext = file_path.suffix.lower()
-            
-            if file_ext == '.xlsx':
-                try:
-                    df = pd.read_excel(filepath, engine='openpyxl')
-                except Exception as e:
-                    logger.warning(f"Failed to read with openpyxl: {e}")
-                    df = pd.read_excel(filepath)
-            elif file_ext == '.xls':
-                logger.info("Reading .xls file using xlrd...")
-                records = StaticDataLoader._read_xls_with_xlrd(filepath)
-                if records:
-                    if max_records:
-                        records = records[:max_records]
-                        logger.info(f"Limited to {max_records} records")
-                    
-                    formatted_records = [StaticDataLoader._format_record(r) for r in records]
-                    logger.info(f"Successfully loaded {len(formatted_records)} records")
-                    return formatted_records
-                else:
-                    logger.error("No records read from .xls file")
-                    return []
-            else:
-                df = pd.read_excel(filepath)
-            
-            if df is None or df.empty:
-                logger.warning("Excel file is empty or could not be read")
-                return []
-            
-            logger.info(f"Loaded {len(df)} rows from Excel file")
-            logger.info(f"Columns: {list(df.columns)}")
-            
-            if max_records:
-                df = df.head(max_records)
-                logger.info(f"Limited to {max_records} records")
-            
-            records = df.where(pd.notnull(df), None).to_dict('records')
-            formatted_records = [StaticDataLoader._format_record(r) for r in records]
-            
-            logger.info(f"Successfully loaded {len(formatted_records)} records")
-            return formatted_records
-            
+            # The whole list is kept anyway, so equal strings across records can share one copy
+            formatted_records = list(StaticDataLoader._iter_records(
+                file_path, max_records, keep_raw, columns, dtypes, use_cache, sheet_name, strings={}
+            ))
         except Exception as e:
-            logger.error(f"Error loading Excel file: {e}", exc_info=True)
+            logger.error("Error loading Excel file: %s", e, exc_info=True)
             return []
+        
+        if not formatted_records:
+            logger.warning("Excel file is empty or could not be read")
+            return []
+        
+        logger.info("Successfully loaded %d records", len(formatted_records))
+        return formatted_records
     
     @staticmethod
-    def _format_record(record: Dict) -> Dict:
-        """Format a single record from Excel to match expected structure"""
-        formatted = {}
-        for key, value in record.items():
-            if pd.isna(value):
-                formatted[key] = None
-            else:
-                normalized_key = str(key).strip().lower().replace(' ', '_').replace('-', '_')
-                formatted[normalized_key] = value
+    def iter_from_excel(filepath: str = "data.xls", max_records: Optional[int] = None,
+                        keep_raw: bool = False, columns: Optional[List[str]] = None,
+                        dtypes: Optional[Dict[str, Any]] = None, use_cache: bool = False,
+                        sheet_name: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily load trademark data from Excel file
         
-        formatted['_raw_excel_data'] = record
-        return formatted
+        Records are formatted and yielded one at a time as sheet rows are read,
+        so callers that handle records individually never hold the whole sheet.
+        
+        Args:
+            filepath: Path to Excel file (default: data.xls)
+            max_records: Optional maximum number of records to yield
+            keep_raw: Attach the unformatted row to each record as _raw_excel_data
+            columns: Optional whitelist of sheet column headers to load
+            dtypes: Optional column dtypes; the sheet is then read with pandas (not supported for .xls)
+            use_cache: Reuse a Parquet copy of the sheet, written next to the Excel file
+            sheet_name: Sheet to read (default: the first sheet)
+            
+        Yields:
+            Trademark records as dictionaries
+            
+        Raises:
+            FileNotFoundError: If the Excel file does not exist
+            ValueError: If dtypes are given for an .xls file
+        """
+        file_path = Path(filepath)
+        StaticDataLoader._check_dtypes(file_path, dtypes)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Excel file not found: {filepath}")
+        
+        yield from StaticDataLoader._iter_records(
+            file_path, max_records, keep_raw, columns, dtypes, use_cache, sheet_name
+        )
     
     @staticmethod
-    def _read_xls_with_xlrd(filepath: str) -> List[Dict]:
-        """Read .xls file using xlrd library directly"""
+    def _iter_records(file_path: Path, max_records: Optional[int] = None, keep_raw: bool = False,
+                      columns: Optional[List[str]] = None,
+                      dtypes: Optional[Dict[str, Any]] = None, use_cache: bool = False,
+                      sheet_name: Optional[str] = None,
+                      strings: Optional[Dict[str, str]] = None) -> Iterator[Dict]:
+        """Format and yield the records of a sheet; see iter_from_excel and _format_row"""
+        sheet_rows = StaticDataLoader._iter_rows(
+            file_path, max_records, columns, dtypes, use_cache, sheet_name
+        )
         try:
-            workbook = xlrd.open_workbook(filepath)
-            sheet = workbook.sheet_by_index(0)
-            
-            header_row_idx = None
-            for row_idx in range(min(10, sheet.nrows)):
-                non_empty_count = sum(1 for col_idx in range(sheet.ncols) 
-                                    if sheet.cell_value(row_idx, col_idx) and 
-                                    str(sheet.cell_value(row_idx, col_idx)).strip())
-                if non_empty_count >= 3:
-                    header_row_idx = row_idx
+            headers = next(sheet_rows, None)
+            if headers is None:
+                return
+            rows = sheet_rows
+            if columns is not None:
+                wanted = set(columns)
+                indices = [i for i, header in enumerate(headers) if header in wanted]
+                headers = [headers[i] for i in indices]
+                rows = ([row[i] for i in indices] for row in sheet_rows)
+            keys = [sys.intern(_normalize_header(header)) for header in headers]
+            for count, row in enumerate(rows):
+                # Reading one row past the limit tells us whether anything was actually dropped
+                if max_records and count == max_records:
+                    logger.info("Limited to %d records", max_records)
                     break
+                record = StaticDataLoader._format_row(keys, row, strings)
+                if keep_raw:
+                    record['_raw_excel_data'] = dict(zip(headers, row))
+                yield record
+        finally:
+            sheet_rows.close()
+    
+    @staticmethod
+    def load_all_sheets(filepath: str = "data.xls", workers: Optional[int] = None,
+                        keep_raw: bool = False) -> Dict[str, List[Dict]]:
+        """
+        Load trademark data from every sheet of an Excel file
+        
+        Sheets are independent, so each one is parsed in its own worker process.
+        
+        Args:
+            filepath: Path to Excel file (default: data.xls)
+            workers: Number of worker processes (default: CPU count)
+            keep_raw: Attach the unformatted row to each record as _raw_excel_data
             
-            if header_row_idx is None:
-                header_row_idx = 0
-                logger.warning("Could not find header row, using first row")
+        Returns:
+            Trademark records of each sheet, keyed by sheet name in workbook order
+        """
+        file_path = Path(filepath)
+        
+        if not file_path.exists():
+            logger.error("Excel file not found: %s", filepath)
+            return {}
+        
+        try:
+            sheet_names = StaticDataLoader._sheet_names(file_path)
+        except Exception as e:
+            logger.error("Error reading sheet names: %s", e, exc_info=True)
+            return {}
+        
+        load_sheet = partial(StaticDataLoader._load_sheet, str(file_path), keep_raw=keep_raw)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(sheet_names) <= 1:
+            sheets = [load_sheet(name) for name in sheet_names]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names))) as executor:
+                sheets = list(executor.map(load_sheet, sheet_names))
+        
+        return dict(zip(sheet_names, sheets))
+    
+    @staticmethod
+    def _load_sheet(filepath: str, sheet_name: str, keep_raw: bool = False) -> List[Dict]:
+        """Load one named sheet; runs in a worker process under load_all_sheets"""
+        return StaticDataLoader.load_from_excel(filepath, keep_raw=keep_raw, sheet_name=sheet_name)
+    
+    @staticmethod
+    def _sheet_names(file_path: Path) -> List[str]:
+        """List the sheet names of an Excel file in workbook order"""
+        file_ext = file_path.suffix.lower()
+        
+        if file_ext in ('.xls', '.xlsx') and CalamineWorkbook is not None:
+            return CalamineWorkbook.from_path(str(file_path)).sheet_names
+        if file_ext == '.xlsx':
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                return workbook.sheetnames
+            finally:
+                workbook.close()
+        if file_ext == '.xls':
+            return xlrd.open_workbook(file_path, on_demand=True).sheet_names()
+        
+        import pandas as pd
+        return pd.ExcelFile(file_path).sheet_names
+    
+    @staticmethod
+    def _check_dtypes(file_path: Path, dtypes: Optional[Dict[str, Any]]) -> None:
+        """Reject dtypes for .xls files, whose header-detecting readers never go through pandas"""
+        if dtypes and file_path.suffix.lower() == '.xls':
+            raise ValueError("dtypes are not supported for .xls files")
+    
+    @staticmethod
+    def _iter_rows(file_path: Path, max_records: Optional[int] = None,
+                   columns: Optional[List[str]] = None,
+                   dtypes: Optional[Dict[str, Any]] = None,
+                   use_cache: bool = False,
+                   sheet_name: Optional[str] = None) -> Iterator[Sequence]:
+        """Yield the header row of a sheet (default: the first), then its non-empty data rows"""
+        # The cache holds the first sheet as read without dtypes, which change how pandas reads cells
+        if use_cache and not dtypes and sheet_name is None:
+            yield from StaticDataLoader._iter_cached_rows(file_path, max_records)
+            return
+        
+        file_ext = file_path.suffix.lower()
+        
+        if file_ext == '.xlsx' and not dtypes:
+            if CalamineWorkbook is not None:
+                logger.info("Reading .xlsx file using python-calamine...")
+                rows = StaticDataLoader._read_xlsx_with_calamine(file_path, sheet_name)
             else:
-                logger.info(f"Found header row at index {header_row_idx}")
-            
-            headers = []
-            for col_idx in range(sheet.ncols):
-                cell_value = sheet.cell_value(header_row_idx, col_idx)
-                header_name = str(cell_value).strip() if cell_value else f"Column_{col_idx}"
-                if not header_name:
-                    header_name = f"Column_{col_idx}"
-                headers.append(header_name)
-            
-            logger.info(f"Found {len(headers)} columns: {headers[:10]}..." if len(headers) > 10 else f"Found {len(headers)} columns: {headers}")
+                logger.info("Reading .xlsx file using openpyxl read-only mode...")
+                rows = StaticDataLoader._read_xlsx_readonly(file_path, sheet_name)
+            try:
+                headers = next(rows, None)
+            except Exception as e:
+                logger.warning("Failed to read .xlsx file, falling back to pandas: %s", e)
+                rows = StaticDataLoader._read_with_pandas(file_path, max_records, columns, dtypes, sheet_name)
+                headers = next(rows, None)
+            if headers is not None:
+                yield headers
+                yield from rows
+        elif file_ext == '.xls':
+            if CalamineWorkbook is not None:
+                logger.info("Reading .xls file using python-calamine...")
+                yield from StaticDataLoader._read_xls_with_calamine(file_path, sheet_name)
+            else:
+                logger.info("Reading .xls file using xlrd...")
+                yield from StaticDataLoader._read_xls_with_xlrd(file_path, sheet_name)
+        else:
+            # Other formats, and .xlsx files read with explicit dtypes
+            yield from StaticDataLoader._read_with_pandas(file_path, max_records, columns, dtypes, sheet_name)
+    
+    @staticmethod
+    def _iter_cached_rows(file_path: Path, max_records: Optional[int] = None) -> Iterator[Sequence]:
+        """
+        Yield sheet rows from a Parquet copy of the sheet kept next to the Excel file
+        
+        The copy is rebuilt from a full read of the sheet whenever it is missing or
+        older than the Excel file. Requires pyarrow; without it the sheet is read directly.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.warning("pyarrow is not installed, reading Excel file without cache")
+            yield from StaticDataLoader._iter_rows(file_path, max_records)
+            return
+        
+        cache_path = file_path.with_suffix(file_path.suffix + '.parquet')
+        if cache_path.exists() and cache_path.stat().st_mtime >= file_path.stat().st_mtime:
+            try:
+                table = pq.read_table(cache_path)
+            except Exception as e:
+                logger.warning("Could not read Excel cache %s: %s", cache_path, e)
+            else:
+                logger.info("Reading cached sheet from: %s", cache_path)
+                if max_records:
+                    table = table.slice(0, max_records)
+                yield table.column_names
+                yield from zip(*(column.to_pylist() for column in table.columns))
+                return
+        
+        rows = list(StaticDataLoader._iter_rows(file_path))
+        if rows:
+            headers, data = rows[0], rows[1:]
+            tmp_path = cache_path.with_suffix('.parquet.tmp')
+            try:
+                arrays = [pa.array([row[col_idx] for row in data]) for col_idx in range(len(headers))]
+                pq.write_table(pa.Table.from_arrays(arrays, names=headers), tmp_path, compression='zstd')
+                tmp_path.replace(cache_path)
+                logger.info("Cached sheet to: %s", cache_path)
+            except Exception as e:
+                # e.g. columns mixing numbers and text have no Parquet type
+                logger.warning("Could not write Excel cache %s: %s", cache_path, e)
+                tmp_path.unlink(missing_ok=True)
+        yield from rows
+    
+    @staticmethod
+    def _format_row(keys: Sequence[str], values: Sequence,
+                    strings: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Build a record from a sheet row, given its normalized column keys
+        
+        When a strings table is given, equal string values share the copy stored in it.
+        Country codes, dates and the like repeat down a column, so this saves memory when
+        all records are kept, but the table holds every distinct string it has seen.
+        """
+        if strings is None:
+            return {key: None if _is_missing(value) else value for key, value in zip(keys, values)}
+        
+        record = {}
+        for key, value in zip(keys, values):
+            if type(value) is str:
+                value = strings.setdefault(value, value)
+            elif _is_missing(value):
+                value = None
+            record[key] = value
+        return record
+    
+    @staticmethod
+    def _read_with_pandas(filepath: Path, max_records: Optional[int] = None,
+                          columns: Optional[List[str]] = None,
+                          dtypes: Optional[Dict[str, Any]] = None,
+                          sheet_name: Optional[str] = None) -> Iterator[Sequence]:
+        """
+        Read a sheet (default: the first) with pandas, yielding the column names and then each row
+        
+        Blank rows are skipped, as by the other readers. The nrows limit passed to pandas
+        still counts them, so fewer than max_records rows may come back.
+        """
+        import pandas as pd
+        
+        # Row limit and column whitelist are handed to the engine so skipped cells are never parsed
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda column: column in wanted
+        df = pd.read_excel(filepath, sheet_name=sheet_name if sheet_name is not None else 0,
+                           nrows=max_records or None, usecols=usecols, dtype=dtypes)
+        if df is None or df.empty:
+            return
+        
+        logger.info("Loaded %d rows from Excel file", len(df))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Columns: %s", list(df.columns))
+        
+        yield list(df.columns)
+        # Box each column to Python objects with one tolist() call, missing cells masked to None,
+        # then zip the columns into rows as they are consumed
+        columns = [series.astype(object).where(series.notna(), None).tolist() for _, series in df.items()]
+        for row in zip(*columns):
+            if all(value is None for value in row):
+                continue
+            yield row
+    
+    @staticmethod
+    def _read_xlsx_readonly(filepath: Path, sheet_name: Optional[str] = None) -> Iterator[Sequence]:
+        """
+        Read .xlsx file with openpyxl in read-only mode
+        
+        Rows are streamed from the sheet XML instead of building every Cell object.
+        The first row is the header; unnamed columns follow pandas' "Unnamed: N" naming.
+        """
+        import openpyxl
+        
+        workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+            headers = [header if header is not None else f"Unnamed: {col_idx}"
+                       for col_idx, header in enumerate(header_row)]
+            yield headers
             
-            records = []
-            for row_idx in range(header_row_idx + 1, sheet.nrows):
-                non_empty_count = sum(1 for col_idx in range(sheet.ncols) 
-                                    if sheet.cell_value(row_idx, col_idx) and 
-                                    str(sheet.cell_value(row_idx, col_idx)).strip())
-                if non_empty_count == 0:
+            padding = (None,) * len(headers)
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                if len(row) < len(headers):
+                    row += padding[len(row):]
+                yield row
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _read_xlsx_with_calamine(filepath: Path, sheet_name: Optional[str] = None) -> Iterator[Sequence]:
+        """
+        Read .xlsx file using python-calamine, decoding the sheet natively
+        
+        Cells are converted to what the openpyxl read-only reader returns, so both
+        produce the same records; the header is the first row, as there.
+        """
+        try:
+            workbook = CalamineWorkbook.from_path(str(filepath))
+            sheet = workbook.get_sheet_by_name(sheet_name) if sheet_name is not None else workbook.get_sheet_by_index(0)
+            rows = sheet.iter_rows()
+        except Exception as e:
+            logger.error("Error reading .xlsx file with python-calamine, falling back to openpyxl: %s", e)
+            yield from StaticDataLoader._read_xlsx_readonly(filepath, sheet_name)
+            return
+        
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        yield [header if header is not None else f"Unnamed: {col_idx}"
+               for col_idx, header in enumerate(_xlsx_row_from_calamine(header_row))]
+        
+        for row in rows:
+            values = _xlsx_row_from_calamine(row)
+            if all(value is None for value in values):
+                continue
+            yield values
+    
+    @staticmethod
+    def _read_xls_with_xlrd(filepath: Path, sheet_name: Optional[str] = None) -> Iterator[list]:
+        """Read .xls file using xlrd library directly"""
+        workbook = xlrd.open_workbook(filepath)
+        sheet = workbook.sheet_by_name(sheet_name) if sheet_name is not None else workbook.sheet_by_index(0)
+        rows = (StaticDataLoader._xlrd_row(sheet, row_idx, workbook.datemode) for row_idx in range(sheet.nrows))
+        yield from StaticDataLoader._iter_sheet_rows(rows)
+    
+    @staticmethod
+    def _xlrd_row(sheet: Any, row_idx: int, datemode: int) -> list:
+        """
+        Read one xlrd sheet row, with date cells as python-calamine returns them
+        
+        xlrd gives dates as Excel serial numbers; they become datetimes, or times for
+        time-only cells, so both .xls readers produce the same rows.
+        """
+        # row_values fetches a whole row per call, so each cell is read once
+        values = sheet.row_values(row_idx)
+        for col_idx, cell_type in enumerate(sheet.row_types(row_idx)):
+            if cell_type == xlrd.XL_CELL_DATE:
+                serial = values[col_idx]
+                value = xlrd.xldate_as_datetime(serial, datemode)
+                values[col_idx] = value.time() if serial < 1 else value
+        return values
+    
+    @staticmethod
+    def _read_xls_with_calamine(filepath: Path, sheet_name: Optional[str] = None) -> Iterator[list]:
+        """Read .xls file using python-calamine, converting rows to Python lazily"""
+        try:
+            workbook = CalamineWorkbook.from_path(str(filepath))
+            sheet = workbook.get_sheet_by_name(sheet_name) if sheet_name is not None else workbook.get_sheet_by_index(0)
+            rows = sheet.iter_rows()
+        except Exception as e:
+            logger.error("Error reading .xls file with python-calamine, falling back to xlrd: %s", e)
+            yield from StaticDataLoader._read_xls_with_xlrd(filepath, sheet_name)
+            return
+        yield from StaticDataLoader._iter_sheet_rows(rows)
+    
+    @staticmethod
+    def _iter_sheet_rows(rows: Iterable[list]) -> Iterator[list]:
+        """Detect the header row among sheet rows, then yield it and each non-empty data row"""
+        rows = iter(rows)
+        leading_rows = list(islice(rows, 10))
+        
+        header_row_idx = None
+        for row_idx, row in enumerate(leading_rows):
+            if _is_header_row(row):
+                header_row_idx = row_idx
+                break
+        
+        if header_row_idx is None:
+            header_row_idx = 0
+            logger.warning("Could not find header row, using first row")
+        else:
+            logger.info("Found header row at index %d", header_row_idx)
+        
+        headers = []
+        for col_idx, cell_value in enumerate(leading_rows[header_row_idx] if leading_rows else []):
+            header_name = str(cell_value).strip() if cell_value else f"Column_{col_idx}"
+            if not header_name:
+                header_name = f"Column_{col_idx}"
+            headers.append(header_name)
+        
+        logger.info("Found %d columns: %s%s", len(headers), headers[:10], "..." if len(headers) > 10 else "")
+        yield headers
+        
+        row_count = 0
+        try:
+            for row in chain(leading_rows[header_row_idx + 1:], rows):
+                if not any(value and str(value).strip() for value in row):
                     continue
                 
-                record = {}
-                for col_idx in range(sheet.ncols):
-                    cell_value = sheet.cell_value(row_idx, col_idx)
-                    if isinstance(cell_value, float) and cell_value == int(cell_value):
-                        cell_value = int(cell_value)
+                values = []
+                for cell_value in row:
+                    # xlrd and calamine return exact floats, so the type() check is safe here
+                    if type(cell_value) is float:
+                        if cell_value.is_integer():
+                            cell_value = int(cell_value)
                     elif cell_value == '':
                         cell_value = None
-                    record[headers[col_idx]] = cell_value
-                records.append(record)
-            
-            logger.info(f"Read {len(records)} data rows from Excel file")
-            return records
-            
-        except Exception as e:
-            logger.error(f"Error reading .xls file: {e}", exc_info=True)
-            return []
-
+                    elif type(cell_value) is date:
+                        # calamine returns date-only cells as date; the transformer expects datetime
+                        cell_value = datetime.combine(cell_value, time())
+                    values.append(cell_value)
+                row_count += 1
+                yield values
+        finally:
+            # Also runs when the caller stops early and closes the generator
+            logger.info("Read %d data rows from Excel file", row_count)